@@ -378,13 +378,8 @@ def generate_dashboard(config: DashboardConfig, args: argparse.Namespace,
         sys.argv = old_argv  # Restore original argv
 
 
-def main():
-    """Main function - orchestrates dashboard generation"""
-    # Setup
-    logger = setup_logging()
-    config = DashboardConfig()
-
-    # Command line arguments
+def build_parser(config: DashboardConfig) -> argparse.ArgumentParser:
+    """Build the command line parser, with defaults taken from config"""
     parser = argparse.ArgumentParser(description='Generate RAD Monitor Dashboard')
     parser.add_argument('baseline_start', nargs='?',
                        default=config.default_baseline_start,
@@ -395,8 +390,17 @@ def main():
     parser.add_argument('current_time', nargs='?',
                        default=config.default_current_time,
                        help='Current time range (e.g., now-12h)')
+    return parser
+
 
-    args = parser.parse_args()
+def main():
+    """Main function - orchestrates dashboard generation"""
+    # Setup
+    logger = setup_logging()
+    config = DashboardConfig()
+
+    # Command line arguments
+    args = build_parser(config).parse_args()
 
     # Start generation
     logger.info("🚀 === Building RAD Dashboard ===")
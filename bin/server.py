@@ -4,7 +4,9 @@ Unified FastAPI Server for RAD Monitor
 Consolidates all server functionality into a single, clean implementation.
 """
 import os
+import re
 import sys
+import ssl
 import json
 import signal
 import asyncio
@@ -16,7 +18,7 @@ from contextlib import asynccontextmanager
 from collections import defaultdict
 
 from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect, HTTPException, Header, BackgroundTasks
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, field_validator
@@ -29,6 +31,16 @@ from pybreaker import CircuitBreaker
 import structlog
 from dotenv import load_dotenv
 
+try:
+    import orjson  # Optional: faster JSON for the proxy path (requirements-enhanced.txt)
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # Optional: lets httpx speak HTTP/2 to Kibana (httpx[http2])
+except ImportError:
+    h2 = None
+
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
@@ -69,13 +81,98 @@ SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
 SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
+# Skip the per-request metrics log line (aggregates stay available on /api/v1/metrics)
+RAD_PROXY_QUIET = os.getenv("RAD_PROXY_QUIET") == "1"
+
 # Kibana configuration
 KIBANA_URL = os.getenv("KIBANA_URL", "https://usieventho-prod-usw2.kb.us-west-2.aws.found.io:9243")
 KIBANA_SEARCH_PATH = "/api/console/proxy?path=traffic-*/_search&method=POST"
+KIBANA_PROXY_URL = f"{KIBANA_URL}{KIBANA_SEARCH_PATH}"
+
+# Largest query body the proxy will forward
+MAX_PROXY_BODY_BYTES = 8 * 1024 * 1024
+
+# Headers sent with every proxied query; only the Cookie varies per request
+KIBANA_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "kbn-xsrf": "true"
+}
+
+# Pulls the sid value out of a full Cookie header ("a=1; sid=xyz; b=2")
+SID_COOKIE_PATTERN = re.compile(r'(?:^|;)\s*sid=([^;]*)')
+
+# Health report fields that never change while the server is running
+HEALTH_STATIC_FIELDS = {
+    "version": "2.0.0",
+    "environment": ENVIRONMENT,
+    "services": {
+        "dashboard": True,
+        "api": True,
+        "websocket": True,
+        "cors": True,
+        "config": True
+    }
+}
 
 # Cache configuration
 CACHE_TTL = timedelta(minutes=5)
 
+# JSON codec for proxied query bodies - orjson when available, stdlib otherwise.
+# orjson only holds 64-bit integers (larger ones are rejected or turned into
+# floats depending on the version), so bodies with long digit runs and anything
+# orjson refuses go through the stdlib, which keeps them exact.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+LONG_NUMBER_PATTERN = re.compile(rb'\d{19}')
+
+if orjson is not None:
+    def json_loads(data: bytes) -> Any:
+        if LONG_NUMBER_PATTERN.search(data):
+            return json.loads(data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return json.dumps(obj).encode('utf-8')
+else:
+    json_loads = json.loads
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+def extract_sid(cookie: str) -> str:
+    """Return the sid value from a full cookie header, or the cookie unchanged"""
+    match = SID_COOKIE_PATTERN.search(cookie)
+    return match.group(1).strip() if match else cookie
+
+def kibana_headers(cookie: str) -> Tuple[Tuple[str, str], ...]:
+    """Headers for a proxied query with the session cookie attached"""
+    return (
+        *KIBANA_BASE_HEADERS.items(),
+        ("Cookie", cookie if cookie.startswith('sid=') else f"sid={cookie}")
+    )
+
+# TLS context for Kibana, built once. Certificate verification is disabled,
+# so no CA bundle is ever loaded into it.
+kibana_ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+kibana_ssl_context.check_hostname = False
+kibana_ssl_context.verify_mode = ssl.CERT_NONE
+
+# Shared Kibana HTTP client - keeps connections (and their TLS sessions) alive
+# across proxied queries instead of re-handshaking on every request. With h2
+# installed, concurrent queries are multiplexed over one HTTP/2 connection.
+KIBANA_TIMEOUT = 30.0
+kibana_client = httpx.AsyncClient(
+    timeout=KIBANA_TIMEOUT,
+    verify=kibana_ssl_context,
+    http2=h2 is not None,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=16)
+)
+
 # ====================
 # Models
 # ====================
@@ -156,6 +253,9 @@ class MetricsTracker:
         if not success:
             self.errors[endpoint] += 1
 
+        if RAD_PROXY_QUIET:
+            return
+
         logger.info("request_metrics",
             endpoint=endpoint,
             duration_ms=duration_ms,
@@ -227,6 +327,7 @@ dashboard_state = {
     "stats": DashboardStats()
 }
 active_connections: List[WebSocket] = []
+ws_snapshots: Dict[str, Tuple[BaseModel, str]] = {}
 query_cache: Dict[str, Tuple[Any, datetime]] = {}
 
 # ====================
@@ -246,6 +347,19 @@ async def broadcast_to_websockets(message: WebSocketMessage):
         if conn in active_connections:
             active_connections.remove(conn)
 
+def ws_snapshot(kind: str) -> str:
+    """Return the encoded WebSocket message for dashboard_state[kind].
+
+    The text is reused until the state entry is replaced, so connecting
+    clients don't re-encode the same config and stats every time.
+    """
+    model = dashboard_state[kind]
+    cached = ws_snapshots.get(kind)
+    if cached is None or cached[0] is not model:
+        text = json.dumps({"type": kind, "data": model.model_dump()}, separators=(",", ":"))
+        cached = ws_snapshots[kind] = (model, text)
+    return cached[1]
+
 def process_dashboard_template(config: DashboardConfig, stats: DashboardStats) -> str:
     """Process HTML template with current data"""
     html_path = Path("index.html")
@@ -273,6 +387,37 @@ def process_dashboard_template(config: DashboardConfig, stats: DashboardStats) -
 
     return content
 
+async def read_body_limited(request: Request, limit: int) -> bytes:
+    """Read the request body, refusing it with a 413 once it exceeds limit bytes.
+
+    A declared Content-Length over the limit is refused before reading;
+    chunked or undeclared bodies are counted as they arrive.
+    """
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail="Request body too large")
+
+    chunks = []
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail="Request body too large")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+async def stream_and_close(response: httpx.Response):
+    """Relay an upstream response body, always releasing its pooled connection.
+
+    Closing happens in the generator itself rather than in a background task,
+    which Starlette skips when the client disconnects mid-stream.
+    """
+    try:
+        async for chunk in response.aiter_bytes():
+            yield chunk
+    finally:
+        await response.aclose()
+
 async def clean_cache():
     """Clean expired cache entries"""
     now = datetime.now()
@@ -321,6 +466,7 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    await kibana_client.aclose()
     logger.info("server_stopped")
 
 # ====================
@@ -347,6 +493,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflights for a day instead of 10 minutes
 )
 
 # Rate limit handler
@@ -404,27 +551,24 @@ async def get_dashboard():
     content = process_dashboard_template(dashboard_state["config"], dashboard_state["stats"])
     return HTMLResponse(content=content)
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
     """Health check endpoint"""
     settings = get_settings()
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "version": "2.0.0",
-        "environment": ENVIRONMENT,
-        "services": {
-            "dashboard": True,
-            "api": True,
-            "websocket": True,
-            "cors": True,
-            "config": True
-        },
-        "checks": {
-            "elasticsearch_configured": bool(settings.elasticsearch.cookie or os.getenv('ELASTIC_COOKIE')),
-            "websocket_connections": len(active_connections)
-        }
-    }
+    # Serialized directly to bytes - health probes are frequent and the payload
+    # is plain JSON, so FastAPI's jsonable_encoder pass is skipped
+    return Response(
+        content=json_dumps_bytes({
+            "status": "healthy",
+            "timestamp": datetime.now().isoformat(),
+            **HEALTH_STATIC_FIELDS,
+            "checks": {
+                "elasticsearch_configured": bool(settings.elasticsearch.cookie or os.getenv('ELASTIC_COOKIE')),
+                "websocket_connections": len(active_connections)
+            }
+        }),
+        media_type="application/json"
+    )
 
 # ====================
 # WebSocket Endpoint
@@ -437,31 +581,27 @@ async def websocket_endpoint(websocket: WebSocket):
     active_connections.append(websocket)
 
     try:
-        # Send initial configuration
-        await websocket.send_json({
-            "type": "config",
-            "data": dashboard_state["config"].model_dump()
-        })
-
-        # Send initial stats
-        await websocket.send_json({
-            "type": "stats",
-            "data": dashboard_state["stats"].model_dump()
-        })
+        # Send initial configuration and stats
+        await websocket.send_text(ws_snapshot("config"))
+        await websocket.send_text(ws_snapshot("stats"))
 
         # Keep connection alive and handle messages
         while True:
-            data = await websocket.receive_json()
+            try:
+                data = json.loads(await websocket.receive_text())
+            except ValueError:
+                data = None
+            # Only JSON objects are messages; anything else gets an error frame
+            if not isinstance(data, dict):
+                await websocket.send_json({"type": "error", "data": {"message": "Invalid JSON"}})
+                continue
 
             # Handle different message types
             if data.get("type") == "ping":
                 await websocket.send_json({"type": "pong"})
             elif data.get("type") == "refresh":
                 # Trigger data refresh
-                await websocket.send_json({
-                    "type": "stats",
-                    "data": dashboard_state["stats"].model_dump()
-                })
+                await websocket.send_text(ws_snapshot("stats"))
 
     except WebSocketDisconnect:
         active_connections.remove(websocket)
@@ -508,8 +648,8 @@ async def kibana_proxy(
 ):
     """Proxy requests to Kibana with CORS support"""
     try:
-        # Get request body
-        raw_body = await request.body()
+        # Get request body, refusing oversized queries
+        raw_body = await read_body_limited(request, MAX_PROXY_BODY_BYTES)
 
         # Use cookie from header or environment
         cookie = x_elastic_cookie or os.environ.get('ELASTIC_COOKIE', '')
@@ -517,13 +657,7 @@ async def kibana_proxy(
             raise HTTPException(status_code=401, detail="No authentication cookie provided")
 
         # Clean up cookie format - extract sid value if full cookie header provided
-        if 'sid=' in cookie:
-            # Extract just the sid value from full cookie header
-            for part in cookie.split(';'):
-                part = part.strip()
-                if part.startswith('sid='):
-                    cookie = part.split('=', 1)[1]
-                    break
+        cookie = extract_sid(cookie)
 
         logger.info("kibana_proxy",
             action="cookie_processed",
@@ -533,13 +667,13 @@ async def kibana_proxy(
 
         # Parse request body - support both wrapped and direct formats
         try:
-            body_data = json.loads(raw_body)
+            body_data = json_loads(raw_body)
 
                         # Check if it's wrapped in our structured format
             if isinstance(body_data, dict) and "query" in body_data:
                 # Extract the actual Elasticsearch query
                 es_query = body_data["query"]
-                query_body = json.dumps(es_query).encode('utf-8')
+                query_body = json_dumps_bytes(es_query)
 
                 # Debug: Log query structure for troubleshooting
                 query_preview = {
@@ -562,10 +696,11 @@ async def kibana_proxy(
                     query_preview=query_preview
                 )
 
-                # Debug: Log first 500 chars of query being sent to ES
+                # Debug: Log first 500 bytes of query being sent to ES (slice
+                # before decoding so large bodies are not copied in full)
                 logger.info("kibana_proxy",
                     action="sending_to_elasticsearch",
-                    query_snippet=query_body.decode('utf-8')[:500] + "..." if len(query_body) > 500 else query_body.decode('utf-8')
+                    query_snippet=query_body[:500].decode('utf-8', errors='replace') + "..." if len(query_body) > 500 else query_body.decode('utf-8')
                 )
             else:
                 # Assume it's already a raw Elasticsearch query
@@ -577,20 +712,14 @@ async def kibana_proxy(
             query_body = raw_body
             logger.info("kibana_proxy", action="passthrough_non_json")
 
-        # Build request
-        proxy_url = f"{KIBANA_URL}{KIBANA_SEARCH_PATH}"
         # Build headers with proper cookie format
-        headers = {
-            "Content-Type": "application/json",
-            "kbn-xsrf": "true",
-            "Cookie": f"sid={cookie}" if not cookie.startswith('sid=') else cookie
-        }
+        headers = kibana_headers(cookie)
 
         # Execute with circuit breaker
         @es_circuit_breaker
         async def execute_request():
-            async with httpx.AsyncClient(timeout=30.0, verify=False) as client:
-                return await client.post(proxy_url, content=query_body, headers=headers)
+            kibana_request = kibana_client.build_request("POST", KIBANA_PROXY_URL, content=query_body, headers=headers)
+            return await kibana_client.send(kibana_request, stream=True)
 
         try:
             response = await execute_request()
@@ -600,35 +729,55 @@ async def kibana_proxy(
                 raise HTTPException(status_code=503, detail="Elasticsearch temporarily unavailable")
             raise
 
+        response_headers = {
+            "Content-Type": response.headers.get("Content-Type", "application/json"),
+            "X-Cache": "miss"
+        }
+
+        # Stream successful results straight through instead of buffering the
+        # whole aggregation payload; the upstream connection is released once
+        # the last chunk has been sent or the client goes away
+        if response.status_code == 200:
+            return StreamingResponse(
+                stream_and_close(response),
+                status_code=response.status_code,
+                headers=response_headers
+            )
+
+        # Error bodies are small - read them fully so they can be logged
+        try:
+            await response.aread()
+        finally:
+            await response.aclose()
+
         # Check for Elasticsearch errors in response
-        if response.status_code != 200:
-            try:
-                error_data = json.loads(response.content)
-                if "error" in error_data:
-                    error_msg = error_data["error"].get("reason", "Unknown error")
-                    error_type = error_data["error"].get("type", "unknown_error")
-                    logger.error("kibana_proxy",
-                        action="elasticsearch_error",
-                        error_type=error_type,
-                        error_reason=error_msg,
-                        status_code=response.status_code
-                    )
-            except:
-                pass  # Ignore parsing errors, return response as-is
+        try:
+            error_data = json_loads(response.content)
+            if "error" in error_data:
+                error_msg = error_data["error"].get("reason", "Unknown error")
+                error_type = error_data["error"].get("type", "unknown_error")
+                logger.error("kibana_proxy",
+                    action="elasticsearch_error",
+                    error_type=error_type,
+                    error_reason=error_msg,
+                    status_code=response.status_code
+                )
+        except:
+            pass  # Ignore parsing errors, return response as-is
 
         return Response(
             content=response.content,
             status_code=response.status_code,
-            headers={
-                "Content-Type": response.headers.get("Content-Type", "application/json"),
-                "X-Cache": "miss"
-            }
+            headers=response_headers
         )
 
     except HTTPException:
         raise
     except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Request to Kibana timed out")
+    except httpx.TransportError as e:
+        logger.error("kibana_proxy_error", error=str(e))
+        raise HTTPException(status_code=502, detail=f"Connection to Kibana failed: {e}")
     except Exception as e:
         logger.error("kibana_proxy_error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -659,13 +808,7 @@ async def test_cookie_format(
             return {"error": "No cookie provided", "status": "missing"}
 
         # Process cookie same way as main proxy
-        processed_cookie = raw_cookie
-        if 'sid=' in processed_cookie:
-            for part in processed_cookie.split(';'):
-                part = part.strip()
-                if part.startswith('sid='):
-                    processed_cookie = part.split('=', 1)[1]
-                    break
+        processed_cookie = extract_sid(raw_cookie)
 
         return {
             "status": "processed",
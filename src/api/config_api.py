@@ -68,16 +68,7 @@ async def get_processing_settings() -> Dict[str, Any]:
     try:
         settings = get_settings()
         return {
-            "config": {
-                "baselineStart": settings.processing.baseline_start,
-                "baselineEnd": settings.processing.baseline_end,
-                "currentTimeRange": settings.processing.current_time_range,
-                "highVolumeThreshold": settings.processing.high_volume_threshold,
-                "mediumVolumeThreshold": settings.processing.medium_volume_threshold,
-                "criticalThreshold": settings.processing.critical_threshold,
-                "warningThreshold": settings.processing.warning_threshold,
-                "minDailyVolume": settings.processing.min_daily_volume
-            },
+            "config": settings.to_processing_config(),
             "baseline_days": settings.baseline_days,
             "thresholds": {
                 "high_volume": settings.processing.high_volume_threshold,
@@ -4,6 +4,7 @@ Single source of truth for all application settings
 """
 
 import os
+import re
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any, Union
@@ -20,6 +21,10 @@ CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
 CONFIG_FILE = CONFIG_DIR / "settings.json"
 ENV_FILE = Path(__file__).parent.parent.parent / ".env"
 
+# Accepted current time range formats: now-12h / now-7d / now-1w,
+# the special inspection_time marker, and custom ranges like -48h-24h
+TIME_RANGE_PATTERN = re.compile(r'^(?:now-\d+[hdw]|inspection_time|-\d+[hd]-\d+[hd])$')
+
 
 class ElasticsearchSettings(BaseSettings):
     """Elasticsearch connection settings"""
@@ -129,13 +134,7 @@ class ProcessingSettings(BaseSettings):
     @field_validator('current_time_range')
     def validate_time_range(cls, v):
         """Validate time range format"""
-        valid_patterns = [
-            r'^now-\d+[hdw]$',  # now-12h, now-7d, now-1w
-            r'^inspection_time$',  # special inspection time
-            r'^-\d+[hd]-\d+[hd]$'  # custom range: -48h-24h
-        ]
-        import re
-        if not any(re.match(pattern, v) for pattern in valid_patterns):
+        if not TIME_RANGE_PATTERN.match(v):
             raise ValueError(f"Invalid time range format: {v}")
         return v
 
@@ -356,8 +355,8 @@ class Settings(BaseSettings):
         
         return Settings(**merged)
     
-    def to_frontend_config(self) -> Dict[str, Any]:
-        """Convert settings to frontend-compatible format"""
+    def to_processing_config(self) -> Dict[str, Any]:
+        """Convert processing settings to the legacy ProcessingConfig format"""
         return {
             "baselineStart": self.processing.baseline_start,
             "baselineEnd": self.processing.baseline_end,
@@ -366,7 +365,13 @@ class Settings(BaseSettings):
             "mediumVolumeThreshold": self.processing.medium_volume_threshold,
             "criticalThreshold": self.processing.critical_threshold,
             "warningThreshold": self.processing.warning_threshold,
-            "minDailyVolume": self.processing.min_daily_volume,
+            "minDailyVolume": self.processing.min_daily_volume
+        }
+
+    def to_frontend_config(self) -> Dict[str, Any]:
+        """Convert settings to frontend-compatible format"""
+        return {
+            **self.to_processing_config(),
             "autoRefreshEnabled": self.dashboard.enable_websocket,
             "autoRefreshInterval": self.dashboard.refresh_interval * 1000,  # Convert to ms
             "theme": self.dashboard.theme,
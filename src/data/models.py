@@ -8,6 +8,13 @@ from datetime import datetime
 from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 import re
 
+# Accepted current time range formats: now-12h / now-1d,
+# custom ranges like -24h-8h, and the special inspection_time marker
+TIME_RANGE_PATTERN = re.compile(r'^(?:now-\d+[hd]|-\d+[hd]-\d+[hd]|inspection_time)$')
+
+# RAD type colors are #RRGGBB
+HEX_COLOR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+
 
 class ElasticBucket(BaseModel):
     """Model for Elasticsearch aggregation bucket"""
@@ -86,12 +93,7 @@ class ProcessingConfig(BaseModel):
     @classmethod
     def validate_time_range(cls, v: str) -> str:
         """Validate time range format"""
-        valid_patterns = [
-            r'^now-\d+[hd]$',  # now-12h, now-1d
-            r'^-\d+[hd]-\d+[hd]$',  # -24h-8h
-            r'^inspection_time$'  # special case
-        ]
-        if not any(re.match(pattern, v) for pattern in valid_patterns):
+        if not TIME_RANGE_PATTERN.match(v):
             raise ValueError(f"Invalid time range format: {v}")
         return v
 
@@ -126,7 +128,7 @@ class RADTypeConfig(BaseModel):
     @classmethod
     def validate_color(cls, v: str) -> str:
         """Validate color is in hex format"""
-        if not re.match(r'^#[0-9A-Fa-f]{6}$', v):
+        if not HEX_COLOR_PATTERN.match(v):
             raise ValueError(f"Color must be in hex format (#RRGGBB): {v}")
         return v
 
@@ -40,14 +40,15 @@ class TrafficProcessor:
         buckets = response['aggregations']['events']['buckets']
         results = []
 
-        # Calculate baseline days
+        # Period lengths are the same for every bucket - work them out once
         baseline_days = self._calculate_baseline_days()
+        current_hours = self._parse_time_range_hours(self.config.get('currentTimeRange', 'now-12h'))
 
         for bucket_data in buckets:
             try:
                 # Validate bucket structure
                 bucket = ElasticBucket(**bucket_data)
-                processed = self._process_bucket(bucket.model_dump(), baseline_days)
+                processed = self._process_bucket(bucket.model_dump(), baseline_days, current_hours)
                 if processed:
                     # Validate processed event
                     validated_event = ProcessedEvent(**processed)
@@ -64,7 +65,7 @@ class TrafficProcessor:
         end = datetime.fromisoformat(self.config['baselineEnd'])
         return max(1, (end - start).days)
 
-    def _process_bucket(self, bucket: Dict[str, Any], baseline_days: int) -> Dict[str, Any]:
+    def _process_bucket(self, bucket: Dict[str, Any], baseline_days: int, current_hours: int) -> Dict[str, Any]:
         """Process a single event bucket"""
         event_id = bucket['key']
         baseline_count = bucket.get('baseline', {}).get('doc_count', 0)
@@ -77,9 +78,6 @@ class TrafficProcessor:
         if daily_avg < self.medium_threshold:
             return None
 
-        # Get current period hours from config
-        current_hours = self._parse_time_range_hours(self.config.get('currentTimeRange', 'now-12h'))
-
         # Calculate expected count for current period
         baseline_period = (baseline_count / baseline_days / 24 * current_hours) if baseline_days > 0 else 0
 
@@ -0,0 +1,21 @@
+"""
+Shared pytest fixtures
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import settings as settings_module
+
+
+@pytest.fixture(autouse=True)
+def reset_settings(monkeypatch):
+    """Give every test a fresh settings singleton so updates can't leak between tests"""
+    monkeypatch.setattr(settings_module, "_settings", None)
+    settings_module.get_settings.cache_clear()
+    yield
+    settings_module.get_settings.cache_clear()
@@ -160,6 +160,18 @@ class TestCentralizedConfig:
         assert frontend_config["kibanaUrl"] == "https://usieventho-prod-usw2.kb.us-west-2.aws.found.io:9243/"
         assert frontend_config["environment"] == "production"
     
+    def test_frontend_config_reflects_changes(self):
+        """Test that the frontend format follows in-place edits and copies"""
+        settings = Settings()
+        settings.to_frontend_config()
+        
+        settings.processing.baseline_start = "2025-01-01"
+        assert settings.to_frontend_config()["baselineStart"] == "2025-01-01"
+        assert settings.to_processing_config()["baselineStart"] == "2025-01-01"
+        
+        debug_settings = settings.model_copy(update={"debug": True})
+        assert debug_settings.to_frontend_config()["environment"] == "development"
+    
     def test_update_from_frontend(self):
         """Test updating from frontend format"""
         settings = Settings()
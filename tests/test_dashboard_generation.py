@@ -3,47 +3,39 @@
 Test the Python dashboard generator
 """
 
+import io
 import os
 import sys
-import json
-import tempfile
-import shutil
+import contextlib
 from pathlib import Path
 import subprocess
 
-# Add parent to path
+import pytest
+
+# Add parent and bin directories to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
 
-def test_dashboard_generator_cli():
-    """Test the dashboard generator command line interface"""
-    # Test help
-    result = subprocess.run([sys.executable, 'bin/generate_dashboard.py', '--help'],
-                          capture_output=True, text=True)
-    assert result.returncode == 0
-    assert 'Generate RAD Monitor Dashboard' in result.stdout
-    assert 'baseline_start' in result.stdout
-    print("✅ CLI help works")
+import generate_dashboard
+from generate_dashboard import build_parser, DashboardConfig, validate_cookie
 
 
-def test_dashboard_generator_import():
-    """Test that the dashboard generator can be imported"""
-    try:
-        sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
-        import generate_dashboard
-        assert hasattr(generate_dashboard, 'main')
-        assert hasattr(generate_dashboard, 'DashboardConfig')
-        assert hasattr(generate_dashboard, 'fetch_kibana_data')
-        print("✅ Module imports correctly")
-    except ImportError as e:
-        print(f"❌ Import failed: {e}")
-        return False
-    return True
+def test_dashboard_generator_cli():
+    """Test the dashboard generator command line interface"""
+    # Test help in-process - the wrapper test below covers the real entry point
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf), pytest.raises(SystemExit) as exc_info:
+        build_parser(DashboardConfig()).parse_args(['--help'])
+    assert exc_info.value.code == 0
+    assert 'Generate RAD Monitor Dashboard' in buf.getvalue()
+    assert 'baseline_start' in buf.getvalue()
 
 
 def test_configuration():
-    """Test the configuration class"""
-    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
-    from generate_dashboard import DashboardConfig
+    """Test the module entry points and the configuration class defaults"""
+    assert hasattr(generate_dashboard, 'main')
+    assert hasattr(generate_dashboard, 'DashboardConfig')
+    assert hasattr(generate_dashboard, 'fetch_kibana_data')
 
     config = DashboardConfig()
     assert config.default_baseline_start == "2025-06-01"
@@ -52,26 +44,27 @@ def test_configuration():
     assert config.high_volume_threshold == 1000
     assert config.critical_threshold == -80
     assert config.data_dir == "data"
-    print("✅ Configuration defaults are correct")
 
 
-def test_cookie_validation():
-    """Test cookie validation functions"""
-    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
-    from generate_dashboard import validate_cookie, get_elastic_cookie
-
-    # Test invalid cookies
-    assert validate_cookie(None) == False
-    assert validate_cookie("") == False
-    assert validate_cookie("short") == False
+COOKIE_CASES = [
+    # Invalid cookies
+    (None, False),
+    ("", False),
+    ("short", False),
+    # Valid cookies
+    ("Fe26.2**" + "x" * 100, True),
+    ("x" * 150, True),
+]
 
-    # Test valid cookies
-    assert validate_cookie("Fe26.2**" + "x" * 100) == True
-    assert validate_cookie("x" * 150) == True
 
-    print("✅ Cookie validation works correctly")
+@pytest.mark.parametrize("cookie, expected", COOKIE_CASES)
+def test_cookie_validation(cookie, expected):
+    """Test cookie validation functions"""
+    assert validate_cookie(cookie) == expected
 
 
+@pytest.mark.xdist_group("subprocess")
+@pytest.mark.skipif(sys.platform.startswith('win'), reason="bash wrapper can't be executed on Windows")
 def test_wrapper_script():
     """Test that the wrapper script works"""
     wrapper_path = Path("scripts/generate_dashboard_refactored.sh")
@@ -83,55 +76,20 @@ def test_wrapper_script():
                           capture_output=True, text=True)
     assert result.returncode == 0
     assert 'Generate RAD Monitor Dashboard' in result.stdout
-    print("✅ Wrapper script works correctly")
 
 
 def test_backward_compatibility():
     """Test that the new implementation maintains backward compatibility"""
-    # The wrapper should accept the same arguments as the old script
+    # The wrapper forwards its arguments untouched...
     wrapper_path = Path("scripts/generate_dashboard_refactored.sh")
+    assert 'bin/generate_dashboard.py "$@"' in wrapper_path.read_text()
 
-    # Test with arguments (dry run with --help to avoid actual execution)
-    result = subprocess.run([str(wrapper_path), "2025-06-01", "2025-06-09", "now-12h", "--help"],
-                          capture_output=True, text=True)
-    # Should still show help even with extra args
-    assert 'Generate RAD Monitor Dashboard' in result.stdout
-    print("✅ Backward compatibility maintained")
-
-
-def main():
-    """Run all tests"""
-    print("🧪 Testing Dashboard Generator Migration")
-    print("=" * 50)
-
-    tests = [
-        test_dashboard_generator_cli,
-        test_dashboard_generator_import,
-        test_configuration,
-        test_cookie_validation,
-        test_wrapper_script,
-        test_backward_compatibility
-    ]
-
-    passed = 0
-    failed = 0
-
-    for test in tests:
-        try:
-            print(f"\nRunning {test.__name__}...")
-            test()
-            passed += 1
-        except Exception as e:
-            print(f"❌ {test.__name__} failed: {e}")
-            failed += 1
-
-    print("\n" + "=" * 50)
-    print(f"✅ Passed: {passed}")
-    print(f"❌ Failed: {failed}")
-
-    return failed == 0
+    # ...and the parser accepts the same positional arguments as the old script
+    args = build_parser(DashboardConfig()).parse_args(["2025-06-01", "2025-06-09", "now-12h"])
+    assert args.baseline_start == "2025-06-01"
+    assert args.baseline_end == "2025-06-09"
+    assert args.current_time == "now-12h"
 
 
 if __name__ == '__main__':
-    success = main()
-    sys.exit(0 if success else 1)
+    pytest.main([__file__, '-v'])
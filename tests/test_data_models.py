@@ -23,6 +23,54 @@ from src.data.models import (
 )
 
 
+def assert_validation_error(exc_info, loc, error_type, message=None):
+    """Assert a ValidationError holds an error of error_type at loc.
+
+    Checks the structured errors() list rather than str(exc), which renders the
+    whole error tree. message is matched against custom validators' msg text.
+    """
+    errors = exc_info.value.errors()
+    assert any(
+        error['loc'] == loc and error['type'] == error_type and (message is None or message in error['msg'])
+        for error in errors
+    ), errors
+
+
+@pytest.fixture(scope="module")
+def base_config():
+    """Minimal valid processing config, shared by the module (tests never mutate it)"""
+    return ProcessingConfig(
+        baselineStart="2025-06-01",
+        baselineEnd="2025-06-09"
+    )
+
+
+@pytest.fixture
+def make_event():
+    """Factory for WARNING-level traffic events; keyword arguments override fields.
+
+    Pass validate=False for trusted fixture data whose field rules aren't under
+    test - the event is built with model_construct and skips validation.
+    """
+    def _make_event(validate=True, **overrides):
+        fields = {
+            "event_id": "feed_test",
+            "display_name": "test",
+            "current": 500,
+            "baseline_12h": 1000,
+            "baseline_period": 1000,
+            "daily_avg": 2000,
+            "baseline_count": 14000,
+            "baseline_days": 7,
+            "current_hours": 12,
+            "score": -50,
+            "status": "WARNING",
+        }
+        fields.update(overrides)
+        return TrafficEvent(**fields) if validate else TrafficEvent.model_construct(**fields)
+    return _make_event
+
+
 class TestElasticBucket:
     """Test ElasticBucket model validation"""
 
@@ -41,19 +89,19 @@ class TestElasticBucket:
         """Test negative doc_count validation"""
         with pytest.raises(ValidationError) as exc_info:
             ElasticBucket(key="feed_test", doc_count=-1)
-        assert "greater than or equal to 0" in str(exc_info.value)
+        assert_validation_error(exc_info, ('doc_count',), 'greater_than_equal')
 
     def test_invalid_event_id_format(self):
         """Test event ID format validation"""
         with pytest.raises(ValidationError) as exc_info:
             ElasticBucket(key="invalid_format", doc_count=10)
-        assert "Unexpected event ID format" in str(exc_info.value)
+        assert_validation_error(exc_info, ('key',), 'value_error', "Unexpected event ID format")
 
     def test_empty_event_id(self):
         """Test empty event ID validation"""
         with pytest.raises(ValidationError) as exc_info:
             ElasticBucket(key="", doc_count=10)
-        assert "Event ID cannot be empty" in str(exc_info.value)
+        assert_validation_error(exc_info, ('key',), 'value_error', "Event ID cannot be empty")
 
 
 class TestElasticResponse:
@@ -89,7 +137,7 @@ class TestElasticResponse:
             ElasticResponse(
                 aggregations={"events": {"doc_count": 100}}
             )
-        assert "Events aggregation must contain 'buckets'" in str(exc_info.value)
+        assert_validation_error(exc_info, ('aggregations', 'events'), 'value_error', "Events aggregation must contain 'buckets'")
 
 
 class TestProcessingConfig:
@@ -109,56 +157,31 @@ class TestProcessingConfig:
         assert config.baselineStart == "2025-06-01"
         assert config.currentTimeRange == "now-12h"
 
-    def test_invalid_date_format(self):
-        """Test invalid date format validation"""
-        with pytest.raises(ValidationError) as exc_info:
-            ProcessingConfig(
-                baselineStart="06/01/2025",  # Wrong format
-                baselineEnd="2025-06-09"
-            )
-        assert "Invalid ISO date format" in str(exc_info.value)
-
-    def test_invalid_time_range_format(self):
-        """Test invalid time range format"""
-        with pytest.raises(ValidationError) as exc_info:
-            ProcessingConfig(
-                baselineStart="2025-06-01",
-                baselineEnd="2025-06-09",
-                currentTimeRange="12 hours ago"  # Invalid format
-            )
-        assert "Invalid time range format" in str(exc_info.value)
-
-    def test_valid_time_range_formats(self):
-        """Test various valid time range formats"""
-        formats = ["now-12h", "now-1d", "-24h-8h", "inspection_time"]
-        for fmt in formats:
-            config = ProcessingConfig(
-                baselineStart="2025-06-01",
-                baselineEnd="2025-06-09",
-                currentTimeRange=fmt
-            )
-            assert config.currentTimeRange == fmt
-
-    def test_threshold_validation(self):
-        """Test threshold validations"""
+    @pytest.mark.parametrize("overrides, loc, error_type, message", [
+        ({"baselineStart": "06/01/2025"}, ('baselineStart',), 'value_error', "Invalid ISO date format"),  # Wrong format
+        ({"currentTimeRange": "12 hours ago"}, ('currentTimeRange',), 'value_error', "Invalid time range format"),
         # Critical must be less than warning
-        with pytest.raises(ValidationError) as exc_info:
-            ProcessingConfig(
-                baselineStart="2025-06-01",
-                baselineEnd="2025-06-09",
-                criticalThreshold=-40,
-                warningThreshold=-50
-            )
-        assert "Critical threshold must be less than warning threshold" in str(exc_info.value)
-
+        ({"criticalThreshold": -40, "warningThreshold": -50}, (), 'value_error',
+         "Critical threshold must be less than warning threshold"),
         # Negative thresholds
+        ({"highVolumeThreshold": -100}, ('highVolumeThreshold',), 'greater_than_equal', None),
+    ])
+    def test_invalid_config(self, overrides, loc, error_type, message):
+        """Test that invalid dates, time ranges and thresholds are rejected"""
+        kwargs = {"baselineStart": "2025-06-01", "baselineEnd": "2025-06-09", **overrides}
         with pytest.raises(ValidationError) as exc_info:
-            ProcessingConfig(
-                baselineStart="2025-06-01",
-                baselineEnd="2025-06-09",
-                highVolumeThreshold=-100
-            )
-        assert "greater than or equal to 0" in str(exc_info.value)
+            ProcessingConfig(**kwargs)
+        assert_validation_error(exc_info, loc, error_type, message)
+
+    @pytest.mark.parametrize("fmt", ["now-12h", "now-1d", "-24h-8h", "inspection_time"])
+    def test_valid_time_range_formats(self, fmt):
+        """Test various valid time range formats"""
+        config = ProcessingConfig(
+            baselineStart="2025-06-01",
+            baselineEnd="2025-06-09",
+            currentTimeRange=fmt
+        )
+        assert config.currentTimeRange == fmt
 
 
 class TestTrafficEvent:
@@ -198,50 +221,26 @@ class TestTrafficEvent:
                 score=-150,  # Out of range
                 status="CRITICAL"
             )
-        assert "greater than or equal to -100" in str(exc_info.value)
+        assert_validation_error(exc_info, ('score',), 'greater_than_equal')
 
-    def test_score_status_consistency(self):
+    def test_score_status_consistency(self, make_event):
         """Test score and status consistency validation"""
         # Critical status with non-critical score
         with pytest.raises(ValidationError) as exc_info:
-            TrafficEvent(
-                event_id="feed_test",
-                display_name="test",
-                current=500,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-50,  # Not critical
-                status="CRITICAL"
-            )
-        assert "CRITICAL status requires score <= -80" in str(exc_info.value)
-
-        # Valid combinations
-        valid_combinations = [
-            (-85, "CRITICAL"),
-            (-60, "WARNING"),
-            (-30, "NORMAL"),
-            (20, "INCREASED")
-        ]
-        for score, status in valid_combinations:
-            event = TrafficEvent(
-                event_id="feed_test",
-                display_name="test",
-                current=500,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=score,
-                status=status
-            )
-            assert event.score == score
-            assert event.status == status
+            make_event(score=-50, status="CRITICAL")  # Not critical
+        assert_validation_error(exc_info, (), 'value_error', "CRITICAL status requires score <= -80")
+
+    @pytest.mark.parametrize("score, status", [
+        (-85, "CRITICAL"),
+        (-60, "WARNING"),
+        (-30, "NORMAL"),
+        (20, "INCREASED")
+    ])
+    def test_valid_score_status(self, make_event, score, status):
+        """Test valid score and status combinations"""
+        event = make_event(score=score, status=status)
+        assert event.score == score
+        assert event.status == status
 
     def test_invalid_status(self):
         """Test invalid status value"""
@@ -259,7 +258,7 @@ class TestTrafficEvent:
                 score=-50,
                 status="UNKNOWN"  # Invalid status
             )
-        assert "Input should be" in str(exc_info.value)
+        assert_validation_error(exc_info, ('status',), 'literal_error')
 
 
 class TestDashboardStats:
@@ -286,46 +285,18 @@ class TestDashboardStats:
                 increased=3,
                 total=25  # Wrong total
             )
-        assert "Total (25) must equal sum of all statuses (20)" in str(exc_info.value)
+        assert_validation_error(exc_info, (), 'value_error', "Total (25) must equal sum of all statuses (20)")
 
 
 class TestDashboardData:
     """Test DashboardData model validation"""
 
-    def test_valid_dashboard_data(self):
+    def test_valid_dashboard_data(self, base_config, make_event):
         """Test valid dashboard data creation"""
-        config = ProcessingConfig(
-            baselineStart="2025-06-01",
-            baselineEnd="2025-06-09"
-        )
-
         events = [
-            TrafficEvent(
-                event_id="feed_test1",
-                display_name="test1",
-                current=100,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-85,
-                status="CRITICAL"
-            ),
-            TrafficEvent(
-                event_id="feed_test2",
-                display_name="test2",
-                current=500,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-50,
-                status="WARNING"
-            )
+            make_event(validate=False, event_id="feed_test1", display_name="test1", current=100,
+                       score=-85, status="CRITICAL"),
+            make_event(validate=False, event_id="feed_test2", display_name="test2")
         ]
 
         stats = DashboardStats(
@@ -339,46 +310,18 @@ class TestDashboardData:
         dashboard = DashboardData(
             events=events,
             stats=stats,
-            config=config
+            config=base_config
         )
 
         assert len(dashboard.events) == 2
         assert dashboard.stats.total == 2
 
-    def test_events_not_sorted(self):
+    def test_events_not_sorted(self, base_config, make_event):
         """Test events sorting validation"""
-        config = ProcessingConfig(
-            baselineStart="2025-06-01",
-            baselineEnd="2025-06-09"
-        )
-
         events = [
-            TrafficEvent(
-                event_id="feed_test1",
-                display_name="test1",
-                current=500,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-50,  # Higher score
-                status="WARNING"
-            ),
-            TrafficEvent(
-                event_id="feed_test2",
-                display_name="test2",
-                current=100,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-85,  # Lower score should be first
-                status="CRITICAL"
-            )
+            make_event(validate=False, event_id="feed_test1", display_name="test1"),  # Higher score
+            make_event(validate=False, event_id="feed_test2", display_name="test2", current=100,
+                       score=-85, status="CRITICAL")  # Lower score should be first
         ]
 
         stats = DashboardStats(
@@ -393,32 +336,13 @@ class TestDashboardData:
             DashboardData(
                 events=events,
                 stats=stats,
-                config=config
+                config=base_config
             )
-        assert "Events must be sorted by score in ascending order" in str(exc_info.value)
+        assert_validation_error(exc_info, ('events',), 'value_error', "Events must be sorted by score in ascending order")
 
-    def test_to_dict_backward_compatibility(self):
+    def test_to_dict_backward_compatibility(self, base_config, make_event):
         """Test backward compatibility of to_dict method"""
-        config = ProcessingConfig(
-            baselineStart="2025-06-01",
-            baselineEnd="2025-06-09"
-        )
-
-        events = [
-            TrafficEvent(
-                event_id="feed_test",
-                display_name="test",
-                current=500,
-                baseline_12h=1000,
-                baseline_period=1000,
-                daily_avg=2000,
-                baseline_count=14000,
-                baseline_days=7,
-                current_hours=12,
-                score=-50,
-                status="WARNING"
-            )
-        ]
+        events = [make_event(validate=False)]
 
         stats = DashboardStats(
             critical=0,
@@ -431,7 +355,7 @@ class TestDashboardData:
         dashboard = DashboardData(
             events=events,
             stats=stats,
-            config=config
+            config=base_config
         )
 
         data_dict = dashboard.to_dict()
@@ -477,7 +401,7 @@ class TestProcessedEvent:
                 baseline_days=7,
                 current_hours=200  # More than 168 (1 week)
             )
-        assert "less than or equal to 168" in str(exc_info.value)
+        assert_validation_error(exc_info, ('current_hours',), 'less_than_equal')
 
 
 if __name__ == "__main__":
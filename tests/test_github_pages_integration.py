@@ -4,26 +4,77 @@ Integration tests to ensure the RAD Monitor works correctly when hosted on GitHu
 Tests the complete flow from GitHub Actions to the deployed dashboard
 """
 
+import io
 import os
+import sys
 import json
+import runpy
 import subprocess
-import tempfile
 import shutil
+from contextlib import redirect_stdout
 from pathlib import Path
 import pytest
 import requests
 from unittest.mock import patch, Mock, MagicMock
 
 
-class TestGitHubPagesIntegration:
-    """Tests to ensure dashboard works correctly on https://balkhalil.github.io/rad-traffic-monitor/"""
+# Files the tests below write into the shared sandbox
+SANDBOX_FILES = (
+    'index.html',
+    'generate_dashboard.py',
+    'data/raw_response.json',
+    'scripts/generate_dashboard_refactored.sh',
+)
+
+# Wrapper script as shipped: it execs the Python generator from the project root
+WRAPPER_SCRIPT = """#!/bin/bash
+# Wrapper script for backward compatibility
+# This now calls the Python version of the dashboard generator
+
+# Get script directory and project root
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+
+# Change to project root
+cd "$PROJECT_ROOT" || exit 1
+
+# Call the Python version with all arguments
+exec python3 generate_dashboard.py "$@"
+"""
+
+# Minimal Python generator that writes the files GitHub Pages serves
+GENERATOR_SCRIPT = """#!/usr/bin/env python3
+import os
+import json
+
+# Create mock data
+os.makedirs('data', exist_ok=True)
+with open('data/raw_response.json', 'w') as f:
+    json.dump({"data": "test"}, f)
+
+# Create mock HTML
+with open('index.html', 'w') as f:
+    f.write('<html><body><h1>RAD Traffic Health Monitor</h1><p>Dashboard on balkhalil.github.io</p></body></html>')
+
+print("Dashboard generated successfully!")
+"""
 
-    def setup_method(self):
-        """Set up test environment"""
-        self.test_dir = tempfile.mkdtemp()
-        self.original_dir = os.getcwd()
-        os.chdir(self.test_dir)
 
+def run_script(path):
+    """Run a Python script in-process as __main__ and return its stdout"""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        runpy.run_path(path, run_name='__main__')
+    return output.getvalue()
+
+
+@pytest.fixture(scope="module")
+def sandbox(tmp_path_factory):
+    """Build the GitHub Pages project layout once per module"""
+    test_dir = tmp_path_factory.mktemp('ghpages')
+    original_dir = os.getcwd()
+    os.chdir(test_dir)
+    try:
         # Create project structure
         os.makedirs('scripts')
         os.makedirs('data')
@@ -41,10 +92,28 @@ class TestGitHubPagesIntegration:
             shutil.copy(project_root / 'generate_dashboard.py', '.')
             os.chmod('generate_dashboard.py', 0o755)
 
-    def teardown_method(self):
-        """Clean up test environment"""
-        os.chdir(self.original_dir)
-        shutil.rmtree(self.test_dir)
+        yield test_dir
+    finally:
+        os.chdir(original_dir)
+
+
+class TestGitHubPagesIntegration:
+    """Tests to ensure dashboard works correctly on https://balkhalil.github.io/rad-traffic-monitor/"""
+
+    @pytest.fixture(autouse=True)
+    def sandbox_dir(self, sandbox):
+        """Run each test in the shared sandbox and undo the files it writes"""
+        snapshot = {
+            name: (sandbox / name).read_bytes()
+            for name in SANDBOX_FILES if (sandbox / name).exists()
+        }
+        yield
+
+        for name in SANDBOX_FILES:
+            if name in snapshot:
+                (sandbox / name).write_bytes(snapshot[name])
+            else:
+                (sandbox / name).unlink(missing_ok=True)
 
     def test_github_actions_workflow_exists(self):
         """Test that GitHub Actions workflow file exists and is valid"""
@@ -65,50 +134,31 @@ class TestGitHubPagesIntegration:
         # Check cron schedule (every 45 minutes)
         assert "cron: '*/45 * * * *'" in content or "*/45 * * * *" in content
 
-    def test_dashboard_generation_for_github_pages(self):
+    def test_dashboard_generation_for_github_pages(self, monkeypatch):
         """Test dashboard generation in GitHub Pages context"""
-        # Create mock generate_dashboard_refactored.sh that calls Python
-        generate_script = """#!/bin/bash
-# Wrapper script for backward compatibility
-# This now calls the Python version of the dashboard generator
+        Path('generate_dashboard.py').write_text(GENERATOR_SCRIPT)
 
-# Get script directory and project root
-SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
-PROJECT_ROOT="$(dirname "$SCRIPT_DIR")"
+        # Run with cookie as GitHub Actions would
+        monkeypatch.setenv('ELASTIC_COOKIE', 'test_github_secret_cookie')
+        output = run_script('generate_dashboard.py')
 
-# Change to project root
-cd "$PROJECT_ROOT" || exit 1
+        assert 'Dashboard generated successfully' in output
+        assert Path('index.html').exists()
+        assert Path('data/raw_response.json').exists()
 
-# Call the Python version with all arguments
-exec python3 generate_dashboard.py "$@"
-"""
+        # Verify HTML content
+        html_content = Path('index.html').read_text()
+        assert 'RAD Traffic Health Monitor' in html_content
+        assert 'balkhalil.github.io' in html_content  # GitHub Pages check
 
-        with open('scripts/generate_dashboard_refactored.sh', 'w') as f:
-            f.write(generate_script)
+    @pytest.mark.slow
+    @pytest.mark.xdist_group("subprocess")
+    def test_wrapper_script_calls_python(self):
+        """Test the wrapper script hands off to the Python generator end to end"""
+        Path('scripts/generate_dashboard_refactored.sh').write_text(WRAPPER_SCRIPT)
         os.chmod('scripts/generate_dashboard_refactored.sh', 0o755)
+        Path('generate_dashboard.py').write_text(GENERATOR_SCRIPT)
 
-        # Create a minimal Python generator for testing
-        python_script = """#!/usr/bin/env python3
-import os
-import json
-
-# Create mock data
-os.makedirs('data', exist_ok=True)
-with open('data/raw_response.json', 'w') as f:
-    json.dump({"data": "test"}, f)
-
-# Create mock HTML
-with open('index.html', 'w') as f:
-    f.write('<html><body><h1>RAD Traffic Health Monitor</h1><p>Dashboard on balkhalil.github.io</p></body></html>')
-
-print("Dashboard generated successfully!")
-"""
-
-        with open('generate_dashboard.py', 'w') as f:
-            f.write(python_script)
-        os.chmod('generate_dashboard.py', 0o755)
-
-        # Run with cookie as GitHub Actions would
         env = os.environ.copy()
         env['ELASTIC_COOKIE'] = 'test_github_secret_cookie'
 
@@ -118,14 +168,8 @@ print("Dashboard generated successfully!")
         assert result.returncode == 0
         assert 'Dashboard generated successfully' in result.stdout
         assert Path('index.html').exists()
-        assert Path('data/raw_response.json').exists()
-
-        # Verify HTML content
-        html_content = Path('index.html').read_text()
-        assert 'RAD Traffic Health Monitor' in html_content
-        assert 'balkhalil.github.io' in html_content  # GitHub Pages check
 
-    def test_python_script_directly(self):
+    def test_python_script_directly(self, monkeypatch):
         """Test that Python script can be called directly in GitHub Actions"""
         # Create a minimal Python generator
         python_script = """#!/usr/bin/env python3
@@ -133,18 +177,14 @@ import sys
 print(f"Python dashboard generator called with args: {sys.argv[1:]}")
 print("Dashboard generated successfully!")
 """
-
-        with open('generate_dashboard.py', 'w') as f:
-            f.write(python_script)
-        os.chmod('generate_dashboard.py', 0o755)
+        Path('generate_dashboard.py').write_text(python_script)
 
         # Test direct Python execution
-        result = subprocess.run([sys.executable, 'generate_dashboard.py', '2025-06-01', '2025-06-09', 'now-12h'],
-                              capture_output=True, text=True)
+        monkeypatch.setattr(sys, 'argv', ['generate_dashboard.py', '2025-06-01', '2025-06-09', 'now-12h'])
+        output = run_script('generate_dashboard.py')
 
-        assert result.returncode == 0
-        assert 'Python dashboard generator called with args' in result.stdout
-        assert "['2025-06-01', '2025-06-09', 'now-12h']" in result.stdout
+        assert 'Python dashboard generator called with args' in output
+        assert "['2025-06-01', '2025-06-09', 'now-12h']" in output
 
     def test_no_cors_proxy_needed_on_github_pages(self):
         """Test that dashboard doesn't require CORS proxy when on GitHub Pages"""
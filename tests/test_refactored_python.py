@@ -89,6 +89,26 @@ class TestTrafficProcessor:
         assert results[0]['current'] == 500
         assert results[0]['daily_avg'] == 1250  # 10000/8
 
+    def test_process_response_parses_periods_once(self):
+        """Test that period lengths are computed once per response, not per bucket"""
+        buckets = [
+            {
+                'key': f'pandc.vnext.recommendations.feed.test{i}',
+                'doc_count': 10500,
+                'baseline': {'doc_count': 10000},
+                'current': {'doc_count': 500}
+            }
+            for i in range(5)
+        ]
+        response = {'aggregations': {'events': {'buckets': buckets}}}
+
+        with patch.object(self.processor, '_parse_time_range_hours', wraps=self.processor._parse_time_range_hours) as mock_parse:
+            results = self.processor.process_response(response)
+
+        assert len(results) == 5
+        assert all(r['current_hours'] == 12 for r in results)
+        mock_parse.assert_called_once_with('now-12h')
+
     def test_parse_time_range_hours(self):
         """Test time range parsing"""
         assert self.processor._parse_time_range_hours('now-6h') == 6
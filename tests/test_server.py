@@ -0,0 +1,525 @@
+"""
+Test suite for the unified FastAPI server
+"""
+
+import gc
+import os
+import sys
+import ssl
+import json
+import anyio
+import pytest
+import httpx
+from contextlib import ExitStack
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, patch
+
+try:
+    import uvloop  # Installed with uvicorn[standard]
+except ImportError:
+    uvloop = None
+
+# Add bin directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bin'))
+
+import server
+from server import app
+
+# Serve the app on uvloop when it is installed, as uvicorn does in production
+backend_options = {"loop_factory": uvloop.new_event_loop} if uvloop is not None else {}
+client = TestClient(app, backend_options=backend_options)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_portal():
+    """Run every request in this module on one event loop.
+
+    Without a portal TestClient starts a fresh loop thread per request; entering
+    the client instead would also run the lifespan, which clears the terminal
+    and closes the shared Kibana client.
+    """
+    with anyio.from_thread.start_blocking_portal(**client.async_backend) as portal:
+        client.portal = portal
+        try:
+            yield portal
+        finally:
+            client.portal = None
+
+
+ES_QUERY = {"size": 0, "query": {"match_all": {}}}
+
+DATE_CASES = [
+    ("2025/06/01", False),  # Wrong separator
+    ("25-06-01", False),    # Wrong year format
+    ("2025-6-1", False),    # Missing leading zeros
+    ("2025-13-01", True),   # Invalid month (pattern passes, logic validation fails)
+    ("2025-06-32", True),   # Invalid day (pattern passes, logic validation fails)
+    ("2025-06-01", True),   # Valid
+]
+# Config update bodies, encoded once at import so the tests only time the server
+BASE_CONFIG = {"baseline_start": "2025-06-01", "baseline_end": "2025-06-09"}
+CONFIG_CASES = [
+    (json.dumps(payload).encode(), status) for payload, status in [
+        (BASE_CONFIG, 200),
+        ({**BASE_CONFIG, "baseline_start": "not-a-date"}, 422),
+        ({"baseline_start": "2025-06-09", "baseline_end": "2025-06-01"}, 422),  # End before start
+        ({**BASE_CONFIG, "critical_threshold": 50}, 422),
+        ({**BASE_CONFIG, "high_volume_threshold": 0}, 422),
+    ]
+]
+CONFIG_CASE_IDS = ["valid", "bad-date", "end-before-start", "positive-critical", "zero-volume"]
+KIBANA_BODY = b'{"took": 5, "aggregations": {"events": {"buckets": []}}}'
+
+
+def kibana_response(status_code=200, content=KIBANA_BODY):
+    """Build a canned Kibana response"""
+    return httpx.Response(status_code, content=content, headers={"Content-Type": "application/json"})
+
+
+class TestDashboardConfig:
+    """Test the DashboardConfig model validation"""
+
+    @pytest.mark.parametrize("date_str, should_pass_pattern", DATE_CASES, ids=[case[0] for case in DATE_CASES])
+    def test_date_pattern_validation(self, date_str, should_pass_pattern):
+        """Test that only YYYY-MM-DD baseline dates pass the pattern check"""
+        try:
+            server.DashboardConfig(baseline_start=date_str, baseline_end="2025-06-09")
+            errors = []
+        except ValidationError as e:
+            errors = e.errors()
+
+        pattern_errors = [
+            error for error in errors
+            if error['type'] == 'string_pattern_mismatch' and error['loc'] == ('baseline_start',)
+        ]
+        if should_pass_pattern:
+            # May still fail on logical validation
+            assert not pattern_errors
+        else:
+            assert pattern_errors
+
+
+class TestDashboardConfigEndpoint:
+    """Test the dashboard config update endpoint"""
+
+    @pytest.mark.parametrize("body, expected_status", CONFIG_CASES, ids=CONFIG_CASE_IDS)
+    def test_update_config(self, monkeypatch, body, expected_status):
+        """Test that config updates are validated before being applied"""
+        monkeypatch.setitem(server.dashboard_state, "config", server.dashboard_state["config"])
+
+        response = client.post(
+            "/api/v1/dashboard/config", content=body, headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == expected_status
+        if expected_status == 200:
+            assert server.dashboard_state["config"].baseline_start == "2025-06-01"
+
+
+class TestHealth:
+    """Test the health check endpoint"""
+
+    def test_health_check(self):
+        """Test that the health report combines static and live fields"""
+        response = client.get("/health")
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/json'
+
+        data = response.json()
+        assert data['status'] == 'healthy'
+        assert data['version'] == '2.0.0'
+        assert data['environment'] == server.ENVIRONMENT
+        assert all(data['services'].values())
+        assert 'timestamp' in data
+        assert data['checks']['websocket_connections'] == len(server.active_connections)
+
+    def test_head_health_no_body(self):
+        """Test that HEAD probes get the GET headers without a body"""
+        response = client.head("/health")
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/json'
+        assert int(response.headers['content-length']) > 0
+        assert response.content == b''
+
+
+@pytest.mark.xdist_group("ws")
+class TestWebSocket:
+    """Test WebSocket functionality"""
+
+    def test_multiple_websocket_connections(self, monkeypatch):
+        """Test that a config update is broadcast to every open connection"""
+        # Restore the shared dashboard config once the test is done
+        monkeypatch.setitem(server.dashboard_state, "config", server.dashboard_state["config"])
+        new_config = {
+            "baseline_start": "2025-07-01",
+            "baseline_end": "2025-07-15",
+            "time_range": "now-6h"
+        }
+
+        with ExitStack() as stack:
+            connections = [stack.enter_context(client.websocket_connect("/ws")) for _ in range(5)]
+            for websocket in connections:
+                assert websocket.receive_json()["type"] == "config"
+                assert websocket.receive_json()["type"] == "stats"
+
+            response = client.post("/api/v1/dashboard/config", json=new_config)
+            assert response.status_code == 200
+
+            for websocket in connections:
+                message = websocket.receive_json()
+                assert message["type"] == "config"
+                assert message["data"]["baseline_start"] == "2025-07-01"
+
+        assert len(server.active_connections) == 0
+
+    def test_initial_snapshot_encoded_once(self, monkeypatch):
+        """Test that connecting clients share one encoding until the config changes"""
+        monkeypatch.setitem(server.dashboard_state, "config", server.dashboard_state["config"])
+        monkeypatch.setattr(server, "ws_snapshots", {})
+
+        for _ in range(2):
+            with client.websocket_connect("/ws") as websocket:
+                assert websocket.receive_json()["data"]["time_range"] == "now-12h"
+                assert websocket.receive_json()["type"] == "stats"
+        first = server.ws_snapshots["config"]
+
+        with client.websocket_connect("/ws") as websocket:
+            websocket.receive_json()
+        assert server.ws_snapshots["config"] is first
+
+        server.dashboard_state["config"] = server.DashboardConfig(
+            baseline_start="2025-07-01", baseline_end="2025-07-15", time_range="now-6h"
+        )
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_json()["data"]["time_range"] == "now-6h"
+
+
+@pytest.mark.xdist_group("ws")
+class TestWebSocketMessages:
+    """Test the ping/refresh protocol over one shared connection"""
+
+    @pytest.fixture(scope="class")
+    def websocket(self):
+        with client.websocket_connect("/ws") as websocket:
+            assert websocket.receive_json()["type"] == "config"
+            assert websocket.receive_json()["type"] == "stats"
+            yield websocket
+
+    def test_ping_pong(self, websocket):
+        """Test that a ping is answered with a pong"""
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+
+    def test_refresh(self, websocket):
+        """Test that a refresh resends the current stats"""
+        websocket.send_json({"type": "refresh"})
+        message = websocket.receive_json()
+        assert message["type"] == "stats"
+        assert message["data"] == server.dashboard_state["stats"].model_dump()
+
+    @pytest.mark.parametrize("text", ["not-json", "[1]"])
+    def test_invalid_message(self, websocket, text):
+        """Test that malformed or non-object JSON gets an error frame and keeps the socket open"""
+        websocket.send_text(text)
+        assert websocket.receive_json() == {"type": "error", "data": {"message": "Invalid JSON"}}
+
+        websocket.send_json({"type": "ping"})
+        assert websocket.receive_json() == {"type": "pong"}
+
+
+class TestMetricsTracker:
+    """Test request metric recording"""
+
+    def test_quiet_mode_skips_request_log(self, monkeypatch):
+        """Test that RAD_PROXY_QUIET drops the log line but keeps the counters"""
+        monkeypatch.setattr(server, 'RAD_PROXY_QUIET', True)
+        tracker = server.MetricsTracker()
+
+        with patch.object(server.logger, 'info') as mock_info:
+            tracker.record_request('kibana_proxy', 12.5, success=False)
+
+        mock_info.assert_not_called()
+        assert tracker.requests['kibana_proxy'] == 1
+        assert tracker.errors['kibana_proxy'] == 1
+
+
+class TestKibanaProxy:
+    """Test the Kibana proxy endpoint"""
+
+    def test_ssl_context_configuration(self):
+        """Test that the shared SSL context accepts Kibana's self-signed certs"""
+        assert server.kibana_ssl_context.check_hostname is False
+        assert server.kibana_ssl_context.verify_mode == ssl.CERT_NONE
+        assert server.kibana_ssl_context.cert_store_stats()['x509'] == 0
+
+    def test_options_preflight_request(self):
+        """Test that CORS preflights are answered and cacheable"""
+        response = client.options(
+            "/api/v1/kibana/proxy",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "Content-Type, X-Elastic-Cookie"
+            }
+        )
+
+        assert response.status_code == 200
+        assert response.headers['access-control-allow-origin'] == 'http://localhost:3000'
+        assert 'POST' in response.headers['access-control-allow-methods']
+        assert 'X-Elastic-Cookie' in response.headers['access-control-allow-headers']
+        assert response.headers['access-control-max-age'] == '86400'
+
+    def test_proxy_requires_cookie(self, monkeypatch):
+        """Test that requests without any cookie are rejected"""
+        monkeypatch.delenv('ELASTIC_COOKIE', raising=False)
+
+        response = client.post("/api/v1/kibana/proxy", json={"query": ES_QUERY})
+        assert response.status_code == 401
+
+    def test_proxy_rejects_oversize_body(self):
+        """Test that bodies above the size cap are refused before forwarding"""
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            response = client.post(
+                "/kibana-proxy",
+                content=b'{}',
+                headers={
+                    "X-Elastic-Cookie": "test_cookie",
+                    "Content-Length": str(server.MAX_PROXY_BODY_BYTES + 1)
+                }
+            )
+
+        assert response.status_code == 413
+        mock_send.assert_not_called()
+
+    def test_proxy_rejects_oversize_chunked_body(self, monkeypatch):
+        """Test that the size cap also holds for bodies without a Content-Length"""
+        monkeypatch.setattr(server, 'MAX_PROXY_BODY_BYTES', 1024)
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        def chunks():
+            for _ in range(3):
+                yield b' ' * 512
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            response = client.post(
+                "/kibana-proxy",
+                content=chunks(),
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == 413
+        mock_send.assert_not_called()
+
+    def test_proxy_request_success(self):
+        """Test that the wrapped query is forwarded to Kibana"""
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            response = client.post(
+                "/kibana-proxy",
+                json={"query": ES_QUERY},
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == 200
+        assert response.content == KIBANA_BODY
+
+        kibana_request = mock_send.call_args[0][0]
+        assert str(kibana_request.url) == server.KIBANA_PROXY_URL
+        assert server.KIBANA_PROXY_URL.endswith("/api/console/proxy?path=traffic-*/_search&method=POST")
+        assert kibana_request.headers['Cookie'] == 'sid=test_cookie'
+        assert kibana_request.headers['kbn-xsrf'] == 'true'
+        assert json.loads(kibana_request.content) == ES_QUERY
+        assert mock_send.call_args[1]['stream'] is True
+
+    def test_proxy_streams_large_response(self):
+        """Test that a chunked Kibana response is relayed intact"""
+        chunks = [b'{"took": 5, "hits": [', b'1,' * 50000, b'1]}']
+        upstream = httpx.Response(
+            200,
+            stream=httpx.ByteStream(b''.join(chunks)),
+            headers={"Content-Type": "application/json"}
+        )
+
+        with patch.object(server.kibana_client, 'send', AsyncMock(return_value=upstream)):
+            response = client.post(
+                "/kibana-proxy",
+                json={"query": ES_QUERY},
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == 200
+        assert response.content == b''.join(chunks)
+        assert upstream.is_closed
+
+    def test_proxy_closes_upstream_on_client_disconnect(self):
+        """Test that the Kibana response is released when the client drops mid-stream"""
+        class ChunkedStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                for _ in range(5):
+                    yield KIBANA_BODY
+
+        upstream = httpx.Response(200, stream=ChunkedStream(), headers={"Content-Type": "application/json"})
+        body = json.dumps({"query": ES_QUERY}).encode()
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0", "spec_version": "2.4"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/kibana-proxy",
+            "raw_path": b"/kibana-proxy",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-elastic-cookie", b"test_cookie"),
+            ],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def post_and_disconnect():
+            messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+            async def receive():
+                return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.body":
+                    raise OSError("client went away")
+
+            try:
+                await app(scope, receive, send)
+            except Exception:
+                pass
+            # The server drops the abandoned response; let its body be finalized
+            gc.collect()
+            for _ in range(10):
+                if upstream.is_closed:
+                    break
+                await anyio.sleep(0)
+
+        with patch.object(server.kibana_client, 'send', AsyncMock(return_value=upstream)):
+            client.portal.call(post_and_disconnect)
+
+        assert upstream.is_closed
+
+    def test_proxy_relays_kibana_errors(self):
+        """Test that Kibana error responses keep their status and body"""
+        error_body = b'{"error": {"type": "search_phase_execution_exception", "reason": "bad query"}}'
+        upstream = kibana_response(status_code=400, content=error_body)
+
+        with patch.object(server.kibana_client, 'send', AsyncMock(return_value=upstream)):
+            response = client.post(
+                "/kibana-proxy",
+                json={"query": ES_QUERY},
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == 400
+        assert response.content == error_body
+        assert upstream.is_closed
+
+    @pytest.mark.parametrize("error, status_code", [
+        (httpx.ReadTimeout("timed out"), 504),
+        (httpx.ConnectError("connection refused"), 502),
+        (RuntimeError("unexpected"), 500),
+    ])
+    def test_proxy_maps_transport_errors(self, error, status_code):
+        """Test that failures reaching Kibana map to distinct status codes"""
+        with patch.object(server.kibana_client, 'send', AsyncMock(side_effect=error)):
+            response = client.post(
+                "/kibana-proxy",
+                json={"query": ES_QUERY},
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == status_code
+
+    def test_proxy_passes_raw_bodies_through(self):
+        """Test that unwrapped and non-JSON bodies are forwarded verbatim"""
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            for body in (b'{"size": 0, "aggs": {}}', b'not-json'):
+                response = client.post(
+                    "/kibana-proxy",
+                    content=body,
+                    headers={"X-Elastic-Cookie": "test_cookie"}
+                )
+                assert response.status_code == 200
+                assert mock_send.call_args[0][0].content == body
+
+    def test_proxy_unwraps_queries_with_large_integers(self):
+        """Test that integers beyond 64 bits survive unwrapping unchanged"""
+        mock_send = AsyncMock(return_value=kibana_response())
+        large = 2 ** 70 + 1
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            response = client.post(
+                "/kibana-proxy",
+                content=f'{{"query": {{"size": 0, "query": {{"term": {{"id": {large}}}}}}}}}'.encode(),
+                headers={"X-Elastic-Cookie": "test_cookie"}
+            )
+
+        assert response.status_code == 200
+        forwarded = json.loads(mock_send.call_args[0][0].content)
+        assert forwarded == {"size": 0, "query": {"term": {"id": large}}}
+
+    def test_extract_sid(self):
+        """Test sid extraction from full cookie headers and bare values"""
+        assert server.extract_sid("abc123") == "abc123"
+        assert server.extract_sid("sid=abc123") == "abc123"
+        assert server.extract_sid("theme=dark; sid=abc123 ; lang=en") == "abc123"
+        assert server.extract_sid("xsid=abc123") == "xsid=abc123"
+
+    def test_proxy_extracts_sid_from_cookie_header(self):
+        """Test that a full cookie header is reduced to its sid value"""
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        with patch.object(server.kibana_client, 'send', mock_send):
+            response = client.post(
+                "/kibana-proxy",
+                json={"query": ES_QUERY},
+                headers={"X-Elastic-Cookie": "theme=dark; sid=test_cookie"}
+            )
+
+        assert response.status_code == 200
+        assert mock_send.call_args[0][0].headers['Cookie'] == 'sid=test_cookie'
+
+    def test_kibana_headers(self):
+        """Test that the session cookie is sent as sid=<value>"""
+        headers = server.kibana_headers("test_cookie")
+        assert dict(headers) == {**server.KIBANA_BASE_HEADERS, "Cookie": "sid=test_cookie"}
+        assert dict(server.kibana_headers("sid=other"))["Cookie"] == "sid=other"
+
+    def test_proxy_reuses_shared_client(self):
+        """Test that consecutive proxy requests go through the one pooled client"""
+        shared_client = server.kibana_client
+        mock_send = AsyncMock(return_value=kibana_response())
+
+        with patch.object(shared_client, 'send', mock_send), \
+             patch.object(shared_client, 'build_request', wraps=shared_client.build_request) as mock_build, \
+             patch('httpx.AsyncClient') as mock_client_class:
+            for _ in range(2):
+                response = client.post(
+                    "/kibana-proxy",
+                    json={"query": ES_QUERY},
+                    headers={"X-Elastic-Cookie": "test_cookie"}
+                )
+                assert response.status_code == 200
+
+        mock_client_class.assert_not_called()
+        assert mock_build.call_count == 2
+        assert mock_send.call_count == 2
+        for call in mock_send.call_args_list:
+            assert str(call.args[0].url) == server.KIBANA_PROXY_URL
+        assert not shared_client.is_closed
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])